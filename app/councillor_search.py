@@ -1,63 +1,145 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from urllib.parse import urlparse
 import hashlib
-import json
+import re
+import orjson
+import shelve
+import time
 from pathlib import Path
 from langchain_core.documents import Document
 
-from tools.google_tool import search_google
+from tools.google_tool import SearchError, search_google, search_google_many
 from tools.logger import logger
 
-@dataclass
+# Cached councillor results are reused for a week before the councillor is searched again
+RESULTS_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Research snippets whose word sets have at least this Jaccard similarity are treated as the same story
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# Snippets with fewer distinct words than this (name excluded) are too short to call near-duplicates
+NEAR_DUPLICATE_MIN_WORDS = 8
+
+# Hosts whose results are classified as social media or official records by _determine_source_type
+_SOCIAL_MEDIA_DOMAINS = ("twitter.com", "x.com", "facebook.com", "linkedin.com", "youtube.com")
+_OFFICIAL_DOMAINS = ("gov.uk", "parliament.uk")
+
+# Closely related research keywords are OR-ed together in groups of this size, one query per group
+RESEARCH_KEYWORDS_PER_QUERY = 3
+
+# Any of these terms in a snippet flags it as a potential business interest
+_BUSINESS_INTEREST_RE = re.compile(r"director|company|business|interest|owner", re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
+def _casefold(text: str) -> str:
+    """Casefolded copy of a snippet or title, computed once per distinct string.
+
+    The same result text is checked by several helpers; Python caches a string's hash,
+    so repeat lookups cost far less than re-folding the whole snippet.
+    """
+    return text.casefold()
+
+# Per-platform social profile rules as (url_check(url, name_parts), text_check(title, content)),
+# all applied to lowercased strings
+_PROFILE_CHECKS = {
+    "linkedin": (
+        lambda url, name_parts: ("linkedin.com/in/" in url and
+                                 any(name in url.split("/")[-1] for name in name_parts)),
+        lambda title, content: "councillor" in content or "council" in content
+    ),
+    "X": (
+        lambda url, name_parts: "x.com/" in url and "/status/" not in url,
+        lambda title, content: "councillor" in title or "cllr" in title
+    ),
+    "facebook": (
+        lambda url, name_parts: "facebook.com/" in url and "/posts/" not in url,
+        lambda title, content: "councillor" in title or "official" in title
+    )
+}
+
+@dataclass(frozen=True)
 class Councillor:
     first_name: str
     last_name: str
     council: str
 
+    # Derived name forms are computed once per councillor rather than per query
+    @cached_property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+    @cached_property
+    def full_name_lower(self) -> str:
+        return self.full_name.casefold()
+
+    @cached_property
+    def name_parts(self) -> Tuple[str, ...]:
+        return tuple(self.full_name_lower.split())
+
+    @cached_property
+    def council_lower(self) -> str:
+        return self.council.casefold()
+
+    @cached_property
+    def quoted_name(self) -> str:
+        """Exact-phrase form of the name used as the anchor of every search query."""
+        return f'"{self.full_name}"'
+
     def generate_search_queries(self) -> List[dict]:
         """Generate investigative search patterns for the councillor."""
-        full_name = f"{self.first_name} {self.last_name}"
+        name = self.quoted_name
+        name_council = f"{name} {self.council}"
         
         # Structured search queries with context
         queries = [
             {
-                "query": f'"{full_name}" councillor {self.council}',
+                "query": f"{name} councillor {self.council}",
                 "category": "basic_info"
             },
             # Political affiliations and changes
             {
-                "query": f'"{full_name}" {self.council} party OR conservative OR labour OR independent',
+                "query": f"{name_council} party OR conservative OR labour OR independent",
                 "category": "political"
             },
             # Voting records and decisions
             {
-                "query": f'"{full_name}" {self.council} vote OR decision OR meeting minutes',
+                "query": f"{name_council} vote OR decision OR meeting minutes",
                 "category": "voting"
             },
             # Business interests and conflicts
             {
-                "query": f'"{full_name}" {self.council} business OR company OR director OR interest',
+                "query": f"{name_council} business OR company OR director OR interest",
                 "category": "business_interests"
             },
             # Public statements and controversies
             {
-                "query": f'"{full_name}" {self.council} controversy OR investigation OR complaint',
+                "query": f"{name_council} controversy OR investigation OR complaint",
                 "category": "controversy"
             },
             # Social media presence
             {
-                "query": f'"{full_name}" {self.council} X OR facebook OR linkedin',
+                "query": f"{name_council} X OR facebook OR linkedin",
                 "category": "social_media"
             }
         ]
         return queries
 
+def _write_json_atomic(output_file: str, data: dict):
+    """Write indented JSON via a temporary file, so a crash mid-write never leaves a truncated file."""
+    path = Path(output_file)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    tmp_path.replace(path)
+
 class CouncillorSearcher:
-    def __init__(self, councillors_file: str = "data/councillors.json"):
+    def __init__(self, councillors_file: str = "data/councillors.json",
+                 cache_file: str = ".councillor_cache"):
         self.councillors = self._load_councillors(councillors_file)
-        self.results_cache = {}
+        # On-disk cache of per-councillor results, so reruns skip councillors already searched
+        self.cache_file = cache_file
         # Store baseline results to filter out later
         self.baseline_results = {}
 
@@ -70,50 +152,96 @@ class CouncillorSearcher:
                 logger.error(f"Councillors file not found at: {path.absolute()}")
                 return []
                 
-            with path.open('r') as f:
-                data = json.load(f)
-                return [
-                    Councillor(
-                        first_name=c['first name'],
-                        last_name=c['last name'],
-                        council=c['council']
-                    ) for c in data['councillor']
-                ]
+            data = orjson.loads(path.read_bytes())
+            return [
+                Councillor(
+                    first_name=c['first name'],
+                    last_name=c['last name'],
+                    council=c['council']
+                ) for c in data['councillor']
+            ]
         except Exception as e:
             logger.error(f"Error loading councillors file: {e}")
             return []
 
+    def _cache_key(self, councillor: Councillor, results_per_query: Optional[int] = None) -> str:
+        """Cache key for a councillor; without results_per_query it is the prefix shared by all entries."""
+        prefix = f"{councillor.full_name}|{councillor.council}|"
+        return prefix if results_per_query is None else f"{prefix}{results_per_query}"
+
+    def _get_cached_results(self, cache_key: str):
+        """Return cached results for the key if present and fresh, otherwise None."""
+        try:
+            with shelve.open(self.cache_file) as cache:
+                entry = cache.get(cache_key)
+        except Exception as e:
+            logger.error(f"Error reading results cache: {e}")
+            return None
+
+        if entry is None or time.time() - entry["cached_at"] > RESULTS_CACHE_TTL:
+            return None
+        return entry["results"]
+
+    def _cache_results(self, cache_key: str, results: dict):
+        """Persist results for the key with the current timestamp."""
+        try:
+            with shelve.open(self.cache_file) as cache:
+                cache[cache_key] = {"cached_at": time.time(), "results": results}
+        except Exception as e:
+            logger.error(f"Error writing results cache: {e}")
+
+    def _update_cached_social_media(self, councillor: Councillor, social_profiles: List[dict]):
+        """Replace the social media profiles in every cached entry for the councillor."""
+        prefix = self._cache_key(councillor)
+        try:
+            with shelve.open(self.cache_file) as cache:
+                for key in [k for k in cache.keys() if k.startswith(prefix)]:
+                    entry = cache[key]
+                    entry["results"]["social_media"] = social_profiles
+                    entry["results"]["summary"] = self._generate_summary(entry["results"])
+                    cache[key] = entry
+        except Exception as e:
+            logger.error(f"Error updating results cache: {e}")
+
     def search_councillor(self, councillor: Councillor, results_per_query: int = 5) -> dict:
-        """Three-stage search process for a councillor."""
-        full_name = f"{councillor.first_name} {councillor.last_name}"
+        """Three-stage search process for a councillor.
+
+        Raises SearchError if any search fails, so incomplete results are never cached.
+        """
+        full_name = councillor.full_name
+        cache_key = self._cache_key(councillor, results_per_query)
+        
+        cached_results = self._get_cached_results(cache_key)
+        if cached_results is not None:
+            logger.info(f"Using cached results for {full_name}")
+            return cached_results
         
         # Stage 1: Social Media Identification
         social_profiles = self.social_media_search(councillor)
         
         # Stage 2: Baseline Search (to be filtered out later)
-        baseline_query = f'"{full_name}" {councillor.council}'
-        try:
-            baseline_results = search_google(baseline_query, top_n=10)
-            self.baseline_results[full_name] = {
-                doc.metadata['link']: doc for doc in baseline_results
-            }
-        except Exception as e:
-            logger.error(f"Error in baseline search: {e}")
-            self.baseline_results[full_name] = {}
+        baseline_query = f"{councillor.quoted_name} {councillor.council}"
+        baseline_results = search_google(baseline_query, top_n=10, raise_errors=True)
+        self.baseline_results[full_name] = {
+            doc.metadata['link']: doc for doc in baseline_results
+        }
 
         # Stage 3: Keyword-based searches
         keyword_results = self._keyword_search(councillor, results_per_query)
         
         # Combine and filter results
-        return self._combine_filtered_results(
+        results = self._combine_filtered_results(
             full_name,
             social_profiles,
             keyword_results
         )
+        self._cache_results(cache_key, results)
+        
+        return results
 
     def _keyword_search(self, councillor: Councillor, results_per_query: int) -> dict:
         """Perform keyword-based searches and filter out baseline results."""
-        full_name = f"{councillor.first_name} {councillor.last_name}"
+        full_name = councillor.full_name
         
         # Define targeted keywords for investigation
         keywords = {
@@ -129,23 +257,28 @@ class CouncillorSearcher:
         
         results = {category: [] for category in keywords.keys()}
         
-        for category, keyword_list in keywords.items():
-            for keyword in keyword_list:
-                query = f'"{full_name}" {councillor.council} {keyword}'
-                try:
-                    search_results = search_google(query, top_n=results_per_query)
-                    
-                    # Filter out baseline results
-                    filtered_results = [
-                        result for result in search_results
-                        if result.metadata['link'] not in self.baseline_results.get(full_name, {})
-                    ]
-                    
-                    results[category].extend(filtered_results)
-                    
-                except Exception as e:
-                    logger.error(f"Error searching {category} with keyword '{keyword}': {e}")
-                    continue
+        query_prefix = f"{councillor.quoted_name} {councillor.council}"
+        baseline_links = frozenset(self.baseline_results.get(full_name, {}))
+        
+        keyword_pairs = [
+            (category, keyword)
+            for category, keyword_list in keywords.items()
+            for keyword in keyword_list
+        ]
+        
+        # Run every keyword search in parallel; results come back in keyword order
+        all_search_results = search_google_many(
+            [f"{query_prefix} {keyword}" for _, keyword in keyword_pairs],
+            top_n=results_per_query,
+            raise_errors=True
+        )
+        
+        for (category, _), search_results in zip(keyword_pairs, all_search_results):
+            # Filter out baseline results
+            results[category].extend(
+                result for result in search_results
+                if result.metadata['link'] not in baseline_links
+            )
         
         return results
 
@@ -153,16 +286,13 @@ class CouncillorSearcher:
                                 social_profiles: List[dict], 
                                 keyword_results: dict) -> dict:
         """Combine social media profiles and filtered keyword results."""
+        # basic_info is never populated but stays in the output schema the frontend reads
         combined_results = {
             "basic_info": [],
             "social_media": social_profiles,
-            "summary": {}
+            **keyword_results
         }
         
-        # Add filtered keyword results
-        for category, results in keyword_results.items():
-            combined_results[category] = results
-        
         # Generate summary
         combined_results["summary"] = self._generate_summary(combined_results)
         
@@ -170,9 +300,22 @@ class CouncillorSearcher:
 
     def _generate_summary(self, results: dict) -> dict:
         """Generate a summary of key findings."""
+        total_results = 0
+        interests = set()
+        
+        # Single pass: count every category and pick out business interests on the way
+        for category, documents in results.items():
+            if category == "summary":
+                continue
+            total_results += len(documents)
+            if category == "business_interests":
+                for doc in documents:
+                    if _BUSINESS_INTEREST_RE.search(doc.page_content):
+                        interests.add(doc.metadata.get("title", ""))
+        
         summary = {
-            "total_results": sum(len(results[cat]) for cat in results if cat != "summary"),
-            "potential_interests": self._extract_business_interests(results["business_interests"]),
+            "total_results": total_results,
+            "potential_interests": list(interests),
             "controversy_count": len(results["controversy"]),
             "has_social_media": bool(results["social_media"]),
         }
@@ -188,9 +331,13 @@ class CouncillorSearcher:
                 "summary": categories["summary"]
             }
             
-            # Format each category's results
+            # Format each category's results; social media holds profile dicts rather than Documents
             for category, documents in categories.items():
-                if category != "summary":
+                if category == "social_media":
+                    formatted_results[councillor_name]["categories"][category] = [
+                        self._format_social_profile(profile) for profile in documents
+                    ]
+                elif category != "summary":
                     formatted_results[councillor_name]["categories"][category] = [
                         {
                             "title": doc.metadata.get("title", ""),
@@ -203,12 +350,22 @@ class CouncillorSearcher:
                     ]
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(formatted_results, f, indent=2, ensure_ascii=False)
+            _write_json_atomic(output_file, formatted_results)
             logger.info(f"Investigative results saved to {output_file}")
         except Exception as e:
             logger.error(f"Error saving results: {e}")
 
+    def _format_social_profile(self, profile: dict) -> dict:
+        """Shape a social media profile like the other saved results (SearchResult on the frontend)."""
+        return {
+            "title": profile["title"],
+            "link": profile["url"],
+            "snippet": f"{profile['platform']} profile",
+            "search_time": "",
+            "relevance_score": profile["confidence_score"],
+            "platform": profile["platform"]
+        }
+
     def _calculate_relevance(self, doc: Document) -> float:
         """Calculate relevance score based on content and metadata."""
         score = 1.0
@@ -223,118 +380,112 @@ class CouncillorSearcher:
             
         return round(score, 2)
 
-    def _extract_business_interests(self, documents: List[Document]) -> List[str]:
-        """Extract potential business interests from documents."""
-        interests = []
-        keywords = ["director", "company", "business", "interest", "owner"]
-        
-        for doc in documents:
-            for keyword in keywords:
-                if keyword.lower() in doc.page_content.lower():
-                    interests.append(doc.metadata.get("title", ""))
-                    break
-                    
-        return list(set(interests))
-
     def search_all_councillors(self, results_per_query: int = 5) -> dict:
-        """Search for all councillors and return results organized by councillor."""
+        """Search for all councillors and return results organized by councillor.
+
+        Each councillor's results are checkpointed to the results cache only once every
+        search for them has succeeded. A councillor whose searches fail is left out and
+        searched again on the next call.
+        """
         results = {}
         
         for councillor in self.councillors:
-            councillor_key = f"{councillor.first_name} {councillor.last_name}"
-            results[councillor_key] = self.search_councillor(councillor, results_per_query)
+            councillor_key = councillor.full_name
+            try:
+                results[councillor_key] = self.search_councillor(councillor, results_per_query)
+            except Exception as e:
+                # search_councillor raises SearchError before caching, so the next run retries them
+                logger.error(f"Error searching {councillor_key}, skipping: {e}")
+                continue
             
             logger.info(f"Completed investigative search for {councillor_key}")
             
         return results
 
     def social_media_search(self, councillor: Councillor) -> List[dict]:
-        """Focused search for councillor social media profiles."""
-        full_name = f"{councillor.first_name} {councillor.last_name}"
+        """Focused search for councillor social media profiles; raises SearchError if a search fails."""
+        name = councillor.quoted_name
         
         social_queries = [
             # LinkedIn - professional profiles
             {
-                "query": f'site:linkedin.com/in/ "{full_name}" {councillor.council} councillor',
+                "query": f"site:linkedin.com/in/ {name} {councillor.council} councillor",
                 "platform": "linkedin"
             },
             # X/X - public statements
             {
-                "query": f'site:X.com "{full_name}" {councillor.council}',
+                "query": f"site:X.com {name} {councillor.council}",
                 "platform": "X"
             },
             # Facebook - public pages and community engagement
             {
-                "query": f'site:facebook.com "{full_name}" councillor {councillor.council}',
+                "query": f"site:facebook.com {name} councillor {councillor.council}",
                 "platform": "facebook"
             }
         ]
         
         social_profiles = []
         
-        for query_info in social_queries:
-            try:
-                results = search_google(query_info["query"], top_n=3)
-                
-                for result in results:
-                    if self._validate_social_profile(result, full_name, query_info["platform"]):
-                        social_profiles.append({
-                            "platform": query_info["platform"],
-                            "url": result.metadata["link"],
-                            "title": result.metadata["title"],
-                            "confidence_score": self._calculate_profile_confidence(result, full_name)
-                        })
-                        
-            except Exception as e:
-                logger.error(f"Error searching {query_info['platform']}: {e}")
-                continue
+        all_results = search_google_many(
+            [query_info["query"] for query_info in social_queries],
+            top_n=3,
+            raise_errors=True
+        )
+        
+        for query_info, results in zip(social_queries, all_results):
+            for result in results:
+                if self._validate_social_profile(result, councillor.name_parts, query_info["platform"]):
+                    social_profiles.append({
+                        "platform": query_info["platform"],
+                        "url": result.metadata["link"],
+                        "title": result.metadata["title"],
+                        "confidence_score": self._calculate_profile_confidence(
+                            result, councillor.name_parts, councillor.council_lower
+                        )
+                    })
             
         return social_profiles
 
-    def _validate_social_profile(self, result: Document, full_name: str, platform: str) -> bool:
+    def _validate_social_profile(self, result: Document, name_parts: Tuple[str, ...], platform: str) -> bool:
         """Enhanced validation for social media profiles."""
-        url = result.metadata["link"].lower()
-        title = result.metadata["title"].lower()
-        content = result.page_content.lower()
-        name_parts = full_name.lower().split()
+        checks = _PROFILE_CHECKS.get(platform)
+        if checks is None:
+            return False
+        url_check, text_check = checks
         
-        # More stringent validation rules
-        if not all(name in f"{title} {content}" for name in name_parts):
+        # The URL test rejects most results, so do it before lowercasing any content
+        url = result.metadata["link"].lower()
+        if not url_check(url, name_parts):
             return False
-            
-        if platform == "linkedin":
-            return ("linkedin.com/in/" in url and 
-                    any(name in url.split("/")[-1] for name in name_parts) and
-                    ("councillor" in content or "council" in content))
         
-        elif platform == "X":
-            return ("X.com/" in url and 
-                    not "/status/" in url and
-                    ("councillor" in title or "cllr" in title))
+        title = _casefold(result.metadata["title"])
+        content = _casefold(result.page_content)
         
-        elif platform == "facebook":
-            return ("facebook.com/" in url and 
-                    not "/posts/" in url and
-                    ("councillor" in title or "official" in title))
+        # More stringent validation rules
+        if not all(name in title or name in content for name in name_parts):
+            return False
         
-        return False
+        return text_check(title, content)
 
-    def _calculate_profile_confidence(self, result: Document, full_name: str) -> float:
+    def _calculate_profile_confidence(self, result: Document, name_parts: Tuple[str, ...],
+                                      council_lower: str) -> float:
         """Calculate confidence score for social media profile match."""
         score = 1.0
-        content = f"{result.metadata['title']} {result.page_content}".lower()
-        name_parts = full_name.lower().split()
+        # Already folded by _validate_social_profile for the same result
+        title = _casefold(result.metadata["title"])
+        content = _casefold(result.page_content)
         
         # Name matching
-        if all(name in content for name in name_parts):
+        if all(name in title or name in content for name in name_parts):
             score *= 1.5
         
         # Role confirmation
-        if "councillor" in content or "cllr" in content:
+        if ("councillor" in title or "cllr" in title or
+                "councillor" in content or "cllr" in content):
             score *= 1.3
         
         # Location matching
-        if councillor.council.lower() in content:
+        if council_lower in title or council_lower in content:
             score *= 1.2
         
         return round(score, 2)
@@ -343,15 +494,12 @@ class CouncillorSearcher:
         """Update councillor records with missing social media profiles."""
         try:
             # Load existing results
-            with open("councillor_results.json", 'r') as f:
-                existing_results = json.load(f)
-            
-            # Initialize searcher
-            searcher = CouncillorSearcher()
+            results_path = Path("councillor_results.json")
+            existing_results = orjson.loads(results_path.read_bytes())
             updates_made = False
             
-            for councillor in searcher.councillors:
-                full_name = f"{councillor.first_name} {councillor.last_name}"
+            for councillor in self.councillors:
+                full_name = councillor.full_name
                 
                 # Check if councillor has no social media profiles
                 if (full_name in existing_results and 
@@ -361,22 +509,28 @@ class CouncillorSearcher:
                     logger.info(f"Searching social media profiles for {full_name}")
                     
                     # Perform focused social media search
-                    social_profiles = self.social_media_search(councillor)
+                    try:
+                        social_profiles = self.social_media_search(councillor)
+                    except SearchError as e:
+                        logger.error(f"Error searching social media for {full_name}, skipping: {e}")
+                        continue
                     
                     if social_profiles:
                         # Update existing results
                         if "categories" not in existing_results[full_name]:
                             existing_results[full_name]["categories"] = {}
                         
-                        existing_results[full_name]["categories"]["social_media"] = social_profiles
+                        existing_results[full_name]["categories"]["social_media"] = [
+                            self._format_social_profile(profile) for profile in social_profiles
+                        ]
+                        self._update_cached_social_media(councillor, social_profiles)
                         updates_made = True
                         
                         logger.info(f"Found {len(social_profiles)} social media profiles for {full_name}")
             
             # Save updated results if changes were made
             if updates_made:
-                with open("councillor_results.json", 'w') as f:
-                    json.dump(existing_results, f, indent=2)
+                _write_json_atomic(results_path, existing_results)
                 logger.info("Updated councillor_results.json with new social media profiles")
             else:
                 logger.info("No new social media profiles found")
@@ -418,24 +572,41 @@ class InvestigativeResearcher:
                 "priority": "medium"
             }
         }
+        self.base_sites = [
+            "site:twitter.com", "site:facebook.com", 
+            "site:linkedin.com", "site:youtube.com",
+            "site:local-news-domain.co.uk"  # Replace with actual local news sites
+        ]
+
+        # Near-synonymous keywords return overlapping results, so search them together
+        self.keyword_groups = {
+            category: [
+                " OR ".join(data["keywords"][i:i + RESEARCH_KEYWORDS_PER_QUERY])
+                for i in range(0, len(data["keywords"]), RESEARCH_KEYWORDS_PER_QUERY)
+            ]
+            for category, data in self.research_categories.items()
+        }
+
+        # One case-insensitive pattern per high-priority category, each worth a single boost
+        self.high_priority_patterns = [
+            re.compile("|".join(map(re.escape, data["keywords"])), re.IGNORECASE)
+            for data in self.research_categories.values()
+            if data["priority"] == "high"
+        ]
 
     def generate_research_queries(self, councillor: Councillor) -> List[dict]:
         """Generate comprehensive research queries."""
-        full_name = f"{councillor.first_name} {councillor.last_name}"
+        name = councillor.quoted_name
         queries = []
 
-        # Base queries with site-specific searches
-        base_sites = [
-            "site:twitter.com", "site:facebook.com", 
-            "site:linkedin.com", "site:youtube.com",
-            "site:local-news-domain.co.uk"  # Replace with actual local news sites
-        ]
+        # Base queries with site-specific searches; the site and name part is shared by every keyword
+        site_prefixes = [f"{site} {name}" for site in self.base_sites]
 
         for category, data in self.research_categories.items():
-            for keyword in data["keywords"]:
-                for site in base_sites:
+            for keywords in self.keyword_groups[category]:
+                for prefix in site_prefixes:
                     queries.append({
-                        "query": f'{site} "{full_name}" {keyword}',
+                        "query": f"{prefix} {keywords}",
                         "category": category,
                         "priority": data["priority"]
                     })
@@ -443,12 +614,12 @@ class InvestigativeResearcher:
         # Add council-specific searches
         queries.extend([
             {
-                "query": f'site:{councillor.council}.gov.uk "{full_name}"',
+                "query": f"site:{councillor.council}.gov.uk {name}",
                 "category": "official_record",
                 "priority": "high"
             },
             {
-                "query": f'"{full_name}" {councillor.council} complaint OR investigation',
+                "query": f"{name} {councillor.council} complaint OR investigation",
                 "category": "complaints",
                 "priority": "high"
             }
@@ -456,17 +627,29 @@ class InvestigativeResearcher:
 
         return queries
 
-    def deduplicate_results(self, results: List[Document]) -> List[ResearchTarget]:
-        """Deduplicate results and prepare for scraping."""
+    def deduplicate_results(self, results: List[Document],
+                            councillor: Optional[Councillor] = None) -> List[ResearchTarget]:
+        """Deduplicate results and prepare for scraping.
+
+        Pass the councillor the results are about so their name, which every result
+        mentions, is ignored when comparing snippets for near-duplicates.
+        """
         unique_results = {}
+        word_sets = {}
+        name_parts = frozenset(councillor.name_parts) if councillor else frozenset()
         
+        # Cheap URL dedup first so the same page returned by several queries is only hashed once
+        results_by_url = {}
         for result in results:
-            # Generate content hash
-            content_hash = hashlib.md5(
-                f"{result.page_content}{result.metadata['title']}".encode()
-            ).hexdigest()
+            results_by_url.setdefault(result.metadata['link'], result)
+        
+        for url, result in results_by_url.items():
+            # Generate content hash (BLAKE2b is faster than MD5 and not blocked in FIPS mode)
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(result.page_content.encode())
+            hasher.update(result.metadata['title'].encode())
+            content_hash = hasher.hexdigest()
             
-            url = result.metadata['link']
             domain = urlparse(url).netloc
             
             # Create research target
@@ -483,8 +666,49 @@ class InvestigativeResearcher:
             if content_hash not in unique_results or \
                target.confidence_score > unique_results[content_hash].confidence_score:
                 unique_results[content_hash] = target
+                word_sets[content_hash] = frozenset(
+                    f"{result.metadata['title']} {result.page_content}".casefold().split()
+                ) - name_parts
+        
+        return self._drop_near_duplicates(list(unique_results.values()), word_sets)
+
+    def _drop_near_duplicates(self, targets: List[ResearchTarget],
+                              word_sets: Dict[str, frozenset]) -> List[ResearchTarget]:
+        """Keep only the highest-confidence target among snippets with near-identical wording.
+
+        Similarity is Jaccard (shared words over all words), so a short snippet is not
+        swallowed by a longer article that merely happens to contain its words, and
+        snippets too short to compare meaningfully are always kept.
+        """
+        kept = []
+        for target in sorted(targets, key=lambda t: t.confidence_score, reverse=True):
+            words = word_sets[target.content_hash]
+            is_duplicate = len(words) >= NEAR_DUPLICATE_MIN_WORDS and any(
+                len(words & kept_words) / len(words | kept_words) >= NEAR_DUPLICATE_THRESHOLD
+                for kept_words in (word_sets[k.content_hash] for k in kept)
+                if len(kept_words) >= NEAR_DUPLICATE_MIN_WORDS
+            )
+            if not is_duplicate:
+                kept.append(target)
         
-        return list(unique_results.values())
+        # Preserve the original ordering of the survivors
+        kept_ids = {id(target) for target in kept}
+        return [target for target in targets if id(target) in kept_ids]
+
+    def _determine_source_type(self, url: str) -> str:
+        """Classify a result URL as social_media, official_record, news or web."""
+        domain = urlparse(url).netloc.lower()
+
+        def on(sites):
+            return any(domain == site or domain.endswith(f".{site}") for site in sites)
+
+        if on(_SOCIAL_MEDIA_DOMAINS):
+            return "social_media"
+        if on(_OFFICIAL_DOMAINS):
+            return "official_record"
+        if any(news in url for news in ['.bbc.', '.guardian.', '.independent.']) or "news" in domain:
+            return "news"
+        return "web"
 
     def _needs_scraping(self, domain: str) -> bool:
         """Determine if content needs ScrapingBee scraping."""
@@ -497,15 +721,12 @@ class InvestigativeResearcher:
     def _calculate_research_confidence(self, result: Document) -> float:
         """Calculate confidence score for research relevance."""
         score = 1.0
-        content = f"{result.metadata['title']} {result.page_content}".lower()
+        content = f"{result.metadata['title']} {result.page_content}"
         
         # Check for high-priority keywords
-        for category, data in self.research_categories.items():
-            if data["priority"] == "high":
-                for keyword in data["keywords"]:
-                    if keyword in content:
-                        score *= 1.5
-                        break
+        for pattern in self.high_priority_patterns:
+            if pattern.search(content):
+                score *= 1.5
 
         # Source credibility
         if "gov.uk" in result.metadata['link']:
@@ -544,7 +765,7 @@ class InvestigativeResearcher:
                             output_file: str = "research_results.json"):
         """Save structured research results."""
         research_data = {
-            "councillor_name": f"{councillor.first_name} {councillor.last_name}",
+            "councillor_name": councillor.full_name,
             "council": councillor.council,
             "last_updated": datetime.now().isoformat(),
             "results": [
@@ -561,8 +782,7 @@ class InvestigativeResearcher:
         }
 
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(research_data, f, indent=2, ensure_ascii=False)
+            _write_json_atomic(output_file, research_data)
             logger.info(f"Research results saved to {output_file}")
         except Exception as e:
             logger.error(f"Error saving research results: {e}")
@@ -586,7 +806,15 @@ def main():
         
         print("\nDetailed Findings:")
         for category, documents in data.items():
-            if category != "summary":
+            if category == "social_media":
+                print(f"\n{category.upper()}:")
+                for profile in documents:
+                    print(f"- Platform: {profile['platform']}")
+                    print(f"  Title: {profile['title']}")
+                    print(f"  Link: {profile['url']}")
+                    print(f"  Confidence: {profile['confidence_score']}")
+                    print()
+            elif category != "summary":
                 print(f"\n{category.upper()}:")
                 for doc in documents:
                     print(f"- Title: {doc.metadata['title']}")
@@ -1,12 +1,50 @@
 import csv
+import threading
 import requests
-import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def get_csrf_token():
-    """Get CSRF token and cookies from the main page"""
+from tools.rate_limiter import RateLimiter
+
+# Be nice to the server: bursts of 10 lookups, pausing only once a window is used up
+BRANCH_LOOKUP_LIMITER = RateLimiter(rate=10, per=10)
+
+# Number of branch lookups kept in flight at once
+MAX_CONCURRENT_LOOKUPS = 5
+
+# Transient server errors are retried with backoff by urllib3; 419 (stale CSRF) is handled in main
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 502, 503],
+    allowed_methods=["GET", "POST"],
+    raise_on_status=False
+)
+
+# CSV output columns; write_branch_rows emits tuples in this order
+FIELDNAMES = (
+    'constituency_searched',
+    'branch_name',
+    'constituency_name',
+    'chair_name',
+    'chair_email',
+    'distance_km',
+    'is_primary'
+)
+
+def create_session():
+    """Create a session with pooled keep-alive connections and automatic retries"""
     session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=RETRY_POLICY))
+    return session
+
+def get_csrf_token(session=None):
+    """Get CSRF token and cookies from the main page, reusing the session if one is given"""
+    if session is None:
+        session = create_session()
     
     # First get the page to get the cookies
     response = session.get('https://donate.reformparty.uk/branches')
@@ -32,103 +70,91 @@ def get_branch_info(session, csrf_token, address):
         'Referer': 'https://donate.reformparty.uk/branches'
     }
     
+    response = None
     try:
         response = session.post(url, json={'address': address}, headers=headers)
         response.raise_for_status()
         return response.json()
     except Exception as e:
         print(f"Error fetching data for {address}: {str(e)}")
-        if response.status_code == 419:
+        if response is not None and response.status_code == 419:
             print(f"Response content: {response.text}")
         return None
 
 def write_branch_rows(writer, constituency, branch_data, is_primary=False):
-    """Write a single branch to the CSV file"""
+    """Write a single branch to the CSV file as a row in FIELDNAMES order"""
     if branch_data is None:
         # Write a row with empty values if no branch data
-        row = {
-            'constituency_searched': constituency,
-            'branch_name': '',
-            'constituency_name': '',
-            'chair_name': '',
-            'chair_email': '',
-            'distance_km': '',
-            'is_primary': is_primary
-        }
+        writer.writerow((constituency, '', '', '', '', '', is_primary))
     else:
-        row = {
-            'constituency_searched': constituency,
-            'branch_name': branch_data.get('name', ''),
-            'constituency_name': branch_data.get('constituency_name', ''),
-            'chair_name': branch_data.get('chair_name', ''),
-            'chair_email': branch_data.get('chair_email', ''),
-            'distance_km': branch_data.get('distance_km', '') if not is_primary else '',
-            'is_primary': is_primary
-        }
-    writer.writerow(row)
+        writer.writerow((
+            constituency,
+            branch_data.get('name', ''),
+            branch_data.get('constituency_name', ''),
+            branch_data.get('chair_name', ''),
+            branch_data.get('chair_email', ''),
+            branch_data.get('distance_km', '') if not is_primary else '',
+            is_primary
+        ))
 
 def main():
-    # Get initial session and CSRF token
-    session, csrf_token = get_csrf_token()
-    
     # Read constituencies from CSV
     constituencies = []
     with open('data/constituencies.csv', 'r') as f:
         reader = csv.DictReader(f)
         constituencies = [row['name'] for row in reader]
     
-    # Prepare CSV output
-    fieldnames = [
-        'constituency_searched',
-        'branch_name',
-        'constituency_name',
-        'chair_name',
-        'chair_email',
-        'distance_km',
-        'is_primary'
-    ]
-    
     # Create or append to CSV file
     file_exists = Path('branch_results.csv').exists()
     
-    with open('branch_results.csv', 'a', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    # Sessions aren't guaranteed thread-safe and a token refresh rewrites the session's cookies,
+    # so each worker keeps its own session and the CSRF token bound to it
+    worker = threading.local()
+    
+    def lookup(constituency):
+        if getattr(worker, 'session', None) is None:
+            worker.session, worker.csrf_token = get_csrf_token()
+        
+        print(f"Processing: {constituency}")
+        
+        # Add ", UK" to make the search more accurate
+        search_term = f"{constituency}, UK"
+        
+        # Get branch info
+        BRANCH_LOOKUP_LIMITER.acquire()
+        branch_data = get_branch_info(worker.session, worker.csrf_token, search_term)
+        
+        # If we get a 419, try refreshing the token once on this worker's session
+        if branch_data is None:
+            print("Refreshing CSRF token...")
+            _, worker.csrf_token = get_csrf_token(worker.session)
+            BRANCH_LOOKUP_LIMITER.acquire()
+            branch_data = get_branch_info(worker.session, worker.csrf_token, search_term)
+        
+        return branch_data
+    
+    with open('branch_results.csv', 'a', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
         
         # Write header only if file is new
         if not file_exists:
-            writer.writeheader()
+            writer.writerow(FIELDNAMES)
         
-        # Process each constituency
-        for constituency in constituencies:
-            print(f"Processing: {constituency}")
-            
-            # Add ", UK" to make the search more accurate
-            search_term = f"{constituency}, UK"
-            
-            # Get branch info
-            branch_data = get_branch_info(session, csrf_token, search_term)
-            
-            # If we get a 419, try refreshing the token once
-            if branch_data is None:
-                print("Refreshing CSRF token...")
-                session, csrf_token = get_csrf_token()
-                branch_data = get_branch_info(session, csrf_token, search_term)
-            
-            # Write data even if branch_data is None
-            if branch_data:
-                # Write primary branch
-                primary_branch = branch_data.get('primary_branch')
-                write_branch_rows(writer, constituency, primary_branch, is_primary=True)
-                
-                # Write nearby branches
-                for branch in branch_data.get('branches', []):
-                    write_branch_rows(writer, constituency, branch, is_primary=False)
-            else:
-                # Write a row with empty values if no data was found
-                write_branch_rows(writer, constituency, None, is_primary=False)
-            
-            # Be nice to the server
-            time.sleep(1)
+        # Look up constituencies concurrently; map() yields in input order so writes stay serial
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_LOOKUPS) as executor:
+            for constituency, branch_data in zip(constituencies, executor.map(lookup, constituencies)):
+                # Write data even if branch_data is None
+                if branch_data:
+                    # Write primary branch
+                    primary_branch = branch_data.get('primary_branch')
+                    write_branch_rows(writer, constituency, primary_branch, is_primary=True)
+                    
+                    # Write nearby branches
+                    for branch in branch_data.get('branches', []):
+                        write_branch_rows(writer, constituency, branch, is_primary=False)
+                else:
+                    # Write a row with empty values if no data was found
+                    write_branch_rows(writer, constituency, None, is_primary=False)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import orjson
+from langchain_core.documents import Document
+
+from app import councillor_search
+
+
+def _fake_search_google(query, top_n=5, raise_errors=False):
+    return []
+
+
+def _fake_search_google_many(queries, top_n=5, raise_errors=False):
+    # Only the LinkedIn profile search finds anything, and its hit passes validation
+    return [
+        [Document(
+            page_content="Jane Doe is a Reform UK councillor for Kent County Council",
+            metadata={
+                "title": "Jane Doe - Councillor - Kent County Council | LinkedIn",
+                "link": "https://www.linkedin.com/in/jane-doe",
+                "search_time": "0.2"
+            }
+        )] if query.startswith("site:linkedin.com/in/") else []
+        for query in queries
+    ]
+
+
+def test_main_saves_councillor_with_validated_profile(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(councillor_search, "search_google", _fake_search_google)
+    monkeypatch.setattr(councillor_search, "search_google_many", _fake_search_google_many)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "councillors.json").write_bytes(orjson.dumps(
+        {"councillor": [{"first name": "Jane", "last name": "Doe", "council": "Kent"}]}
+    ))
+
+    councillor_search.main()
+
+    saved = orjson.loads((tmp_path / "councillor_results.json").read_bytes())["Jane Doe"]
+    assert saved["summary"]["has_social_media"] is True
+    assert saved["categories"]["social_media"] == [{
+        "title": "Jane Doe - Councillor - Kent County Council | LinkedIn",
+        "link": "https://www.linkedin.com/in/jane-doe",
+        "snippet": "linkedin profile",
+        "search_time": "",
+        "relevance_score": 2.34,
+        "platform": "linkedin"
+    }]
+    assert "Link: https://www.linkedin.com/in/jane-doe" in capsys.readouterr().out
@@ -1,72 +1,295 @@
 import os
+import asyncio
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Tuple
+from dataclasses import dataclass
 import re
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+import orjson
+import requests
 from langchain_core.documents import Document
 
 from tools.logger import logger
+from tools.rate_limiter import RateLimiter
 
-load_dotenv()
+@dataclass(frozen=True)
+class SearchHit:
+    """A single search result, far lighter than a Document; cached results are stored as these."""
+    __slots__ = ("page_content", "title", "link", "search_time")
+    page_content: str
+    title: str
+    link: str
+    search_time: str
 
-def search_google(query: str, top_n: int = 5) -> List[Document]:
-    """Search Google for the given query and return the top N results."""
-    
-    # Force reload environment variables
+    # Frozen fields can't be restored by the default slot setattr, which breaks pickle and copy
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def to_document(self) -> Document:
+        return Document(
+            page_content=self.page_content,
+            metadata={
+                'title': self.title,
+                'link': self.link,
+                'search_time': self.search_time
+            }
+        )
+
+class SearchError(Exception):
+    """Raised instead of returning [] when a search made with raise_errors=True fails."""
+
+# Credentials are read once; call reload_config() to pick up changes to .env or the environment
+_API_KEY = None
+_CSE_ID = None
+# Latched by reload_config so a misconfiguration is logged once, not on every search
+_CONFIG_OK = False
+
+def reload_config():
+    """Re-read GOOGLE_API_KEY and GOOGLE_CSE_ID, with .env taking precedence over the environment."""
+    global _API_KEY, _CSE_ID, _CONFIG_OK
     load_dotenv(override=True)
+    _API_KEY = os.getenv("GOOGLE_API_KEY")
+    _CSE_ID = os.getenv("GOOGLE_CSE_ID")
+    _CONFIG_OK = bool(_API_KEY and _CSE_ID)
+    if not _CONFIG_OK:
+        logger.error("Missing GOOGLE_API_KEY or GOOGLE_CSE_ID in environment variables; searches will return no results")
+
+reload_config()
+
+# Snippets keep only ASCII letters, digits and whitespace
+_CLEAN_RE = re.compile(r'[^a-zA-Z0-9\s]')
+
+# Caps in-flight CSE requests across all threads, regardless of how many pools fan out
+_SEARCH_SLOTS = threading.BoundedSemaphore(int(os.getenv("GOOGLE_MAX_CONCURRENCY", 8)))
+
+# Bounded LRU of recent results, each entry expiring after the TTL: key -> (expires_at, hits)
+_CACHE_MAX = int(os.getenv("GOOGLE_CACHE_MAX", 1024))
+_CACHE_TTL = float(os.getenv("GOOGLE_CACHE_TTL", 3600))
+_RESULT_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+def _cache_get(key: tuple):
+    """Return cached hits for the key, or None if absent or expired."""
+    with _CACHE_LOCK:
+        entry = _RESULT_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, hits = entry
+        if expires_at < time.monotonic():
+            del _RESULT_CACHE[key]
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        return hits
+
+def _cache_put(key: tuple, hits: Tuple[SearchHit, ...]):
+    """Store hits under the key, evicting the least recently used entries past the limit."""
+    with _CACHE_LOCK:
+        _RESULT_CACHE[key] = (time.monotonic() + _CACHE_TTL, hits)
+        _RESULT_CACHE.move_to_end(key)
+        while len(_RESULT_CACHE) > _CACHE_MAX:
+            _RESULT_CACHE.popitem(last=False)
+
+def _cache_clear():
+    with _CACHE_LOCK:
+        _RESULT_CACHE.clear()
+
+_SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+
+# Google CSE returns at most 10 results per query
+_MAX_RESULTS_PER_QUERY = 10
+
+# Seconds to wait on a connect or read before giving up, so a stuck connection can't pin a worker
+_REQUEST_TIMEOUT = float(os.getenv("GOOGLE_TIMEOUT", 5))
+
+# Google CSE allows 100 queries per 100 seconds per user; stay just under it
+_SEARCH_LIMITER = RateLimiter(rate=90, per=100)
+
+# Server errors and dropped connections are retried with exponential backoff. 429 is not:
+# it usually means the daily quota is spent, and retrying would only spend more
+_MAX_ATTEMPTS = 4
+_BACKOFF_FACTOR = 0.2
+_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# Sessions aren't guaranteed thread-safe, so each worker thread keeps its own keep-alive session
+_THREAD_LOCAL = threading.local()
+
+def _get_session() -> requests.Session:
+    """Return the calling thread's HTTP session, creating it on first use."""
+    session = getattr(_THREAD_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["Accept"] = "application/json"
+        _THREAD_LOCAL.session = session
+    return session
+
+# Requests currently being fetched, so concurrent identical searches share one HTTP call
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def _fetch_results(query: str, num: int, api_key: str, cse_id: str) -> Tuple[SearchHit, ...]:
+    """Run a single CSE request, retrying transient failures.
+
+    Every attempt takes its own rate limiter slot. Errors propagate rather than returning []
+    so that failed requests are never cached.
+    """
+    params = {
+        "q": query,
+        "cx": cse_id,
+        "key": api_key,
+        "num": num
+    }
+    session = _get_session()
+    for attempt in range(_MAX_ATTEMPTS):
+        if attempt:
+            # Back off outside _SEARCH_SLOTS so a waiting retry doesn't hold up other searches
+            time.sleep(_BACKOFF_FACTOR * 2 ** (attempt - 1))
+        _SEARCH_LIMITER.acquire()
+        try:
+            with _SEARCH_SLOTS:
+                response = session.get(_SEARCH_URL, params=params, timeout=_REQUEST_TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == _MAX_ATTEMPTS - 1:
+                raise
+            continue
+        if response.status_code not in _RETRY_STATUSES:
+            break
+    response.raise_for_status()
+
+    return _format_results(query, orjson.loads(response.content))
+
+def _format_results(query: str, result: dict) -> Tuple[SearchHit, ...]:
+    """Convert a raw CSE response into SearchHits with cleaned snippets."""
+    # Hoist per-response values and attribute lookups out of the per-item loop
+    search_time = result.get('searchTime', '')
+    clean = _CLEAN_RE.sub
+    hits = tuple(
+        SearchHit(
+            page_content=clean('', item.get('snippet', '')),
+            title=item.get('title', ''),
+            link=item.get('link', ''),
+            search_time=search_time
+        )
+        for item in result.get('items') or ()
+    )
+
+    logger.info(f"Successfully retrieved {len(hits)} results for query: {query}")
+    return hits
+
+def _load_credentials():
+    """Return (api_key, cse_id), or None if either is missing (already logged by reload_config)."""
+    if not _CONFIG_OK:
+        return None
+    api_key, cse_id = _API_KEY, _CSE_ID
     
-    # Validate environment variables
-    api_key = os.getenv("GOOGLE_API_KEY")
-    cse_id = os.getenv("GOOGLE_CSE_ID")
-    
-    logger.debug(f"Using API Key: {api_key[:10]}...")
-    logger.debug(f"Using CSE ID: {cse_id}")
+    # Lazy %-style arguments so nothing is formatted unless DEBUG is enabled
+    logger.debug("Using API Key: %s...", api_key[:10])
+    logger.debug("Using CSE ID: %s", cse_id)
+    return api_key, cse_id
+
+def _normalize_query(query: str) -> str:
+    """Cache key form of a query: lowercased with whitespace collapsed.
+
+    Google matches case-insensitively, except that only an uppercase OR is an operator,
+    so that token keeps its case.
+    """
+    return " ".join(token if token == "OR" else token.lower() for token in query.split())
+
+def search_google_hits(query: str, top_n: int = 5, raise_errors: bool = False) -> List[SearchHit]:
+    """Search Google for the given query and return the top N results as SearchHits.
+
+    Failures are logged and return [], which looks the same as a query with no hits;
+    pass raise_errors=True to get a SearchError instead, e.g. before caching the results.
+    """
+    credentials = _load_credentials()
+    if credentials is None:
+        if raise_errors:
+            raise SearchError("Missing GOOGLE_API_KEY or GOOGLE_CSE_ID")
+        return []
+    api_key, cse_id = credentials
     
-    if not api_key or not cse_id:
-        logger.error("Missing GOOGLE_API_KEY or GOOGLE_CSE_ID in environment variables")
+    num = int(top_n)
+    if num <= 0:
         return []
+    num = min(num, _MAX_RESULTS_PER_QUERY)
+        
+    # Results only depend on the query's meaning and the number actually requested from the API;
+    # the original query text is still what gets sent
+    key = (_normalize_query(query), num)
+    hits = _cache_get(key)
+    if hits is not None:
+        return list(hits)
+        
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_leader = future is None
+        if is_leader:
+            # The previous leader may have filled the cache since we last looked
+            hits = _cache_get(key)
+            if hits is not None:
+                return list(hits)
+            future = _INFLIGHT[key] = Future()
         
     try:
-        # Initialize the Google Custom Search API service
-        service = build(
-            "customsearch", "v1",
-            developerKey=api_key,
-            cache_discovery=False
-        )
+        if not is_leader:
+            return list(future.result())
+        
+        try:
+            hits = _fetch_results(query, num, api_key, cse_id)
+            _cache_put(key, hits)
+            future.set_result(hits)
+            return list(hits)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                del _INFLIGHT[key]
 
-        # Create a custom search instance
-        result = service.cse().list(
-            q=query,
-            cx=cse_id,
-            num=min(top_n, 5)  # Google CSE has a max of 10 results per query
-        ).execute()
-
-        # Format results
-        documents = []
-        if 'items' in result:
-            for item in result['items']:
-                # Clean snippet text
-                snippet = item.get('snippet', '')
-                snippet = re.sub(r'[^a-zA-Z0-9\s]', '', snippet)
-
-                # Create document
-                doc = Document(
-                    page_content=snippet,
-                    metadata={
-                        'title': item.get('title', ''),
-                        'link': item.get('link', ''),
-                        'search_time': result.get('searchTime', '')
-                    }
-                )
-                documents.append(doc)
-
-        logger.info(f"Successfully retrieved {len(documents)} results for query: {query}")
-        return documents
-
-    except HttpError as e:
-        logger.error(f"Google API HTTP Error: {e.resp.status} - {e.content}")
+    except requests.HTTPError as e:
+        logger.error(f"Google API HTTP Error: {e.response.status_code} - {e.response.text}")
+        if raise_errors:
+            raise SearchError(f"Google API HTTP Error {e.response.status_code} for query: {query}") from e
         return []
     except Exception as e:
         logger.error(f"Google search error: {str(e)}")
-        return [] 
\ No newline at end of file
+        if raise_errors:
+            raise SearchError(f"Google search failed for query: {query}") from e
+        return []
+
+def search_google(query: str, top_n: int = 5, raise_errors: bool = False) -> List[Document]:
+    """Search Google for the given query and return the top N results."""
+    # Each caller gets fresh Documents, so mutating one never alters the cached results
+    return [hit.to_document() for hit in search_google_hits(query, top_n, raise_errors)]
+
+search_google.cache_clear = search_google_hits.cache_clear = _cache_clear
+
+# Shared worker threads for synchronous fan-out; each keeps its own session between searches
+_POOL = ThreadPoolExecutor(max_workers=int(os.getenv("GOOGLE_POOL", 8)), thread_name_prefix="google-search")
+
+def search_google_many(queries: List[str], top_n: int = 5, raise_errors: bool = False) -> List[List[Document]]:
+    """Search all queries in parallel on the shared pool, returning results in query order.
+
+    With raise_errors=True a failed query raises its SearchError instead of contributing [].
+    """
+    return list(_POOL.map(partial(search_google, top_n=top_n, raise_errors=raise_errors), queries))
+
+async def asearch_google(query: str, top_n: int = 5) -> List[Document]:
+    """Async variant of search_google for callers running on an event loop.
+
+    The request runs on the loop's default executor, so it shares the cache, rate
+    limiter and concurrency cap with synchronous callers.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(search_google, query, top_n))
+
+async def asearch_many(queries: List[str], top_n: int = 5) -> List[List[Document]]:
+    """Search all queries concurrently, returning results in query order."""
+    return list(await asyncio.gather(*(asearch_google(query, top_n) for query in queries)))
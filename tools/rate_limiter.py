@@ -0,0 +1,31 @@
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """Thread-safe limiter permitting at most `rate` calls in any `per`-second window."""
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block only as long as needed for a slot to free up, then claim it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+
+                # Drop timestamps that have left the window
+                while self._calls and now - self._calls[0] >= self.per:
+                    self._calls.popleft()
+
+                if len(self._calls) < self.rate:
+                    self._calls.append(now)
+                    return
+
+                wait = self.per - (now - self._calls[0])
+
+            time.sleep(wait)